@@ -1,10 +1,10 @@
 """This is the module for manipulating cut files containing one or more field cuts from TICRA Tools, GRASP and CHAMP
 """
 
-import math
-
 import numpy
 
+import graspfile.numpy_utilities as numpy_utilities
+
 
 class GraspSingleCut:
     """Class for reading, holding, manipulating and writing GRASP 9.3 format
@@ -82,10 +82,11 @@ class GraspSingleCut:
                 * `2`: for far field
                 * `3`: for near field.  3rd component is always E_z"""
 
-        self.data = numpy.ndarray((0, 0))
+        self.components = numpy.ndarray((0, 0), dtype=complex)
         """numpy.ndarray: Cut Data as complex array of field components.
 
-        Shape of array is ``(v_num, field_components)``"""
+        Shape of array is ``(field_components, v_num)``, so that the data for each field component is contiguous in
+        memory.  See :attr:`data` for the same array indexed by position first."""
 
     def read(self, lines):
         """Read cut from lines of text and parse as a cut, filing the
@@ -110,18 +111,20 @@ class GraspSingleCut:
         self.icut = int(specs[5])
         self.field_components = int(specs[6])
 
-        # Create the numpy structured array for the data
-        self.data = numpy.zeros((self.v_num, self.field_components), dtype=complex)
+        # Parse all the data lines in one go, and copy them once into the component-first layout
+        data = numpy_utilities.loadtxt_complex(lines[:self.v_num], self.field_components)
+        self.components = data.T.copy()
+
+    @property
+    def data(self):
+        """``numpy.ndarray``: Cut Data as complex array of field components.
 
-        # Parse lines
-        for i in range(self.v_num):
-            lline = lines[i].split()
-            if lline[0] == "Field":
-                continue
-            self.data[i, 0] = complex(float(lline[0]), float(lline[1]))
-            self.data[i, 1] = complex(float(lline[2]), float(lline[3]))
-            if self.field_components == 3:
-                self.data[i, 2] = complex(float(lline[4]), float(lline[5]))
+        Shape of array is ``(v_num, field_components)``.  This is a transposed view of :attr:`components`."""
+        return self.components.T
+
+    @data.setter
+    def data(self, new_data):
+        self.components = numpy.ascontiguousarray(numpy.asarray(new_data).T)
 
     @property
     def positions(self):
@@ -143,30 +146,27 @@ class GraspSingleCut:
 
         output.v_ini = pos_min
         output.v_inc = self.v_inc
-        output.v_num = math.ceil((pos_max - pos_min) / self.v_inc)
         output.constant = self.constant
         output.polarization = self.polarization
         output.icut = self.icut
         output.field_components = self.field_components
 
-        # Find the indices of points just within the pos_min and pos_max
-        # limits
-        i_min = 0
-        i_max = self.data.shape[0]
-        for d in range(self.data.shape[0]):
-            if self.positions[d] >= pos_min:
-                if i_min == 0:
-                    i_min = d
-            if self.positions[d] >= pos_max:
-                if i_max > d:
-                    i_max = d
-
-        # Set v_ini and v_num
-        output.v_ini = self.positions[i_min]
-        output.v_num = i_max - i_min + 1
+        # Find the indices of points within the pos_min and pos_max limits.
+        # This works whether the cut is swept with increasing or decreasing position
+        positions = self.positions
+        in_range = numpy.flatnonzero((positions >= pos_min) & (positions <= pos_max))
+        if len(in_range):
+            i_min = in_range[0]
+            i_max = in_range[-1] + 1
+            output.v_ini = positions[i_min]
+        else:
+            i_min = i_max = 0
+
+        # Set v_num
+        output.v_num = int(i_max - i_min)
 
         # Set data
-        output.data = self.data[i_min:i_max, :]
+        output.components = self.components[:, i_min:i_max]
 
         return output
 
@@ -207,18 +207,18 @@ class GraspCut:
 
     def read(self, fi):
         """Read the contents from filelike fi and parse into cut objects"""
-        text = fi.readlines()
-
         self.constants = []
         # Constants contains a list of constants (typically phi angles)
         # When values are repeated, it indicates that a second set of cuts is
-        # in the file
+        # in the file.  Keep a set of the same values for fast membership tests
+        seen_constants = set()
 
         self.cut_sets.append(GraspCutSet())
         cut_set = 0
         temp_text = []
-        # Read through the file, splitting the lines into separate cuts
-        for line in text:
+        # Read through the file a line at a time, splitting the lines into separate cuts.  Each cut is parsed as
+        # soon as it is complete, so only one cut's text is held in memory at once
+        for line in fi:
             if len(line.split()) == 7:
                 # We have the start of a new cut
                 # Have we already collected a cut?
@@ -226,16 +226,18 @@ class GraspCut:
                     # Create new cut
                     new_cut = GraspSingleCut()
                     new_cut.read(temp_text)
-                    if new_cut.constant in self.constants:
+                    if new_cut.constant in seen_constants:
                         # We must start a new cut_set
                         self.cut_sets.append(GraspCutSet())
                         cut_set += 1
                         self.constants = []
+                        seen_constants.clear()
                     self.cut_sets[cut_set].cuts.append(new_cut)
                     self.constants.append(new_cut.constant)
+                    seen_constants.add(new_cut.constant)
                     temp_text = []
 
-            if len(line.strip()) > 0:
+            if line and not line.isspace():
                 temp_text.append(line)
 
         # Append the last cut to the file
@@ -1,10 +1,7 @@
 """This is the module for manipulating grid files containing one or more field cuts from TICRA Tools, GRASP and CHAMP
 """
 
-try:
-    import configparser
-except ImportError:
-    import ConfigParser as configparser
+import configparser
 
 import numpy
 
@@ -91,6 +88,9 @@ class GraspField:
         # We can now initialise the numpy arrays to hold the field data
         self.field = numpy.zeros(shape=(self.grid_n_x, self.grid_n_y, self.field_components), dtype=complex)
 
+        # Collect the data lines and the extent of each row, so that all the data can be parsed in one go
+        rows = []
+        lines = []
         for j in range(self.grid_n_y):
             # If k_limit is 1 then rows of grid are sparse (i.e. limited length)
             # read the limits from each line before reading in data
@@ -102,16 +102,18 @@ class GraspField:
                 i_s = 0
                 i_e = self.grid_n_x
 
-            # Read in the data
-            for i in range(i_s, i_e):
-                line = fi.readline().split()
-                if self.field_components == 2:
-                    self.field[j, i, 0] = complex(float(line[0]), float(line[1]))
-                    self.field[j, i, 1] = complex(float(line[2]), float(line[3]))
-                else:
-                    self.field[j, i, 0] = complex(float(line[0]), float(line[1]))
-                    self.field[j, i, 1] = complex(float(line[2]), float(line[3]))
-                    self.field[j, i, 2] = complex(float(line[4]), float(line[5]))
+            rows.append((j, i_s, i_e))
+            lines.extend(fi.readline() for i in range(i_s, i_e))
+
+        if not lines:
+            return 0
+
+        data = numpy_utilities.loadtxt_complex(lines, self.field_components)
+
+        n = 0
+        for j, i_s, i_e in rows:
+            self.field[j, i_s:i_e, :] = data[n:n + i_e - i_s]
+            n += i_e - i_s
 
         return 0
 
@@ -341,7 +343,7 @@ class GraspGrid:
 
         while 1:
             line = fi.readline()
-            if line[0:4] == "++++":
+            if line.startswith("++++"):
                 break
             else:
                 self.header.append(line)
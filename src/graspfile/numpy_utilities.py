@@ -10,3 +10,12 @@ def find_nearest_idx(array, value):
 def find_nearest(array, value):
     """Return the nearest value in an array to the given value"""
     return array[find_nearest_idx(array, value)]
+
+
+def loadtxt_complex(lines, n_components):
+    """Parse lines of (re, im) pairs into a complex array of shape ``(len(lines), n_components)``.
+
+    Any columns after the first n_components pairs are ignored.  The parsed floats are made contiguous so that they
+    can be viewed directly as complex values without another copy."""
+    values = np.loadtxt(lines, dtype=float, ndmin=2)
+    return np.ascontiguousarray(values[:, :2 * n_components]).view(complex)
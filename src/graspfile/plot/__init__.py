@@ -59,6 +59,32 @@ def get_axes(n_axes, ax_label=None, ay_label=None):
     return fig, axes
 
 
+def _scratch_for(field, scratch=None):
+    """Return a float array shaped like a single component of field, reusing scratch if it already fits.
+
+    ``imshow`` copies the data it is given, so the same buffer can safely be refilled for each field plotted."""
+    shape = field.field.shape[:2]
+    if scratch is None or scratch.shape != shape:
+        scratch = np.empty(shape, dtype=np.float64)
+    return scratch
+
+
+def _amplitude(z, out, db=True):
+    """Write the amplitude of complex array z into out, in dB if db is True, without allocating temporaries."""
+    np.abs(z, out=out)
+    if db:
+        np.log10(out, out=out)
+        out *= 20
+    return out
+
+
+def _phase(z, out):
+    """Write the phase of complex array z in degrees into out, without allocating temporaries."""
+    np.arctan2(z.imag, z.real, out=out)
+    out *= 180.0 / np.pi
+    return out
+
+
 def get_max_fields(fields, step, component=0, db=True):
     """Finds the maximum amplitude in the set of fields and return a suitable common limit for plotting all fields.
 
@@ -78,12 +104,10 @@ def get_max_fields(fields, step, component=0, db=True):
         limit = 0.0
 
     for field in fields:
+        # log10 is monotonic, so take the maximum amplitude first and only convert that single value to dB
+        max_data = np.amax(np.abs(field.field[:, :, component]))
         if db:
-            data = 20 * np.log10(np.abs(field.field[:, :, component]))
-        else:
-            data = np.abs(field.field[:, :, component])
-
-        max_data = np.amax(data)
+            max_data = 20 * np.log10(max_data)
         if not db:
             step = max_data / 10.0
         if max_data > limit:
@@ -125,20 +149,16 @@ def plot_amplitude_fields(fields, component, suptitle=None, titles=None, xlabel=
         else:
             v_min = 0.0
 
+    scratch = None
     for f, field in enumerate(fields):
         ax = axes[f]
         ax.axis('on')
 
-        if db:
-            im = ax.imshow(20 * np.log10(np.abs(field.field[:, :, component])),
-                           cmap=cmap, interpolation=None, origin="lower",
-                           extent=[field.grid_min_x, field.grid_max_x, field.grid_min_y, field.grid_max_y],
-                           vmin=v_min, vmax=v_max)
-        else:
-            im = ax.imshow((np.abs(field.field[:, :, component])),
-                           cmap=cmap, interpolation=None, origin="lower",
-                           extent=[field.grid_min_x, field.grid_max_x, field.grid_min_y, field.grid_max_y],
-                           vmin=v_min, vmax=v_max)
+        scratch = _scratch_for(field, scratch)
+        im = ax.imshow(_amplitude(field.field[:, :, component], scratch, db),
+                       cmap=cmap, interpolation=None, origin="lower",
+                       extent=[field.grid_min_x, field.grid_max_x, field.grid_min_y, field.grid_max_y],
+                       vmin=v_min, vmax=v_max)
         ax.grid(color='w', linestyle='--')
         if titles:
             ax.set_title(titles[f])
@@ -208,11 +228,13 @@ def plot_phase_fields(fields, component, suptitle=None, titles=None, xlabel=None
         v_min = -180.0
         v_max = 180.0
 
+    scratch = None
     for f, field in enumerate(fields):
         ax = axes[f]
         ax.axis('on')
 
-        im = ax.imshow(np.angle(field.field[:, :, component], deg=True),
+        scratch = _scratch_for(field, scratch)
+        im = ax.imshow(_phase(field.field[:, :, component], scratch),
                        cmap=cmap, interpolation=None, origin="lower",
                        extent=[field.grid_min_x, field.grid_max_x, field.grid_min_y, field.grid_max_y],
                        vmin=v_min, vmax=v_max)
@@ -220,7 +242,7 @@ def plot_phase_fields(fields, component, suptitle=None, titles=None, xlabel=None
         if titles:
             ax.set_title(titles[f])
 
-    fig.suplots_adjust(right=0.85)
+    fig.subplots_adjust(right=0.85)
     cbar_ax = fig.add_axes([0.87, 0.13, 0.02, 0.7])
     cbar = fig.colorbar(im, cax=cbar_ax)
     cbar.ax.set_ylabel(vlabel)
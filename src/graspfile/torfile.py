@@ -1,22 +1,32 @@
 """A class to hold a parsed GRASP Tor File in a collection of objects"""
 
-from collections import OrderedDict
+import functools
+import logging
+import os
+import pickle
 
+import graspfile
 import graspfile.torparser as torparser
 
-_debug_ = False
-
-# trick for py2/3 compatibility
-if 'basestring' not in globals():
-    basestring = str
+log = logging.getLogger(__name__)
 
 """List of acceptable GraspTorObject types"""
 grasp_object_types = [""]
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_tor_object(tor_str):
+    """Parse a string containing a single tor object.
+
+    The parse results are only read when filling objects, so they are cached to avoid reparsing identical strings."""
+    return torparser.tor_object.parseString(tor_str)
+
+
 class GraspTorValue:
     """A container for values from GraspTorMember objects"""
 
+    __slots__ = ("value", "unit")
+
     def __init__(self, tor_value="_None"):
         """Container for values within GraspTorMember, GraspTorStruct, and GraspTorSequence objects.
 
@@ -40,7 +50,7 @@ class GraspTorValue:
         if self.unit:
             return repr(self.value) + " " + self.unit
         else:
-            if isinstance(self.value, basestring):
+            if isinstance(self.value, str):
                 return self.value
             else:
                 return repr(self.value)
@@ -51,27 +61,22 @@ class GraspTorValue:
         Args:
             tor_value: a `pyparsing.ParseResults` class output by the torparser module.
         """
-        if _debug_:
-            print("GraspTorValue.fill received: {:}".format(tor_value))
+        log.debug("GraspTorValue.fill received: %r", tor_value)
 
-        try:
-            if isinstance(tor_value, basestring):
-                self.value = tor_value
-            else:
-                if len(tor_value) > 1:
-                    self.value = tor_value[0]
-                    self.unit = tor_value[1]
-                else:
-                    self.value = tor_value[0]
-        except TypeError:
-            if _debug_:
-                print("TypeError caught for tor_value = {:}".format(tor_value))
+        # Values with units arrive as a [value, unit] group, while plain numbers and strings arrive bare
+        if isinstance(tor_value, (list, torparser.pp.ParseResults)):
+            self.value = tor_value[0]
+            if len(tor_value) > 1:
+                self.unit = tor_value[1]
+        else:
             self.value = tor_value
 
 
 class GraspTorMember:
     """A container for the member parameter of an GraspTorObject """
 
+    __slots__ = ("name", "_type", "_value")
+
     def __init__(self, tor_member=None):
         self.name = None
 
@@ -86,8 +91,7 @@ class GraspTorMember:
         return self._value.__repr__()
 
     def fill(self, tor_member):
-        if _debug_:
-            print("GraspTorMember.fill received: {:}".format(tor_member))
+        log.debug("GraspTorMember.fill received: %r", tor_member)
 
         self.name = tor_member[0]
         if len(tor_member) > 2:
@@ -95,12 +99,9 @@ class GraspTorMember:
         else:
             self._type = "value"
 
-        if self._type == "struct":
-            self._value = GraspTorStruct(tor_member[1:])
-        elif self._type == "ref":
-            self._value = GraspTorRef(tor_member[1:])
-        elif self._type == "sequence":
-            self._value = GraspTorSequence(tor_member[1:])
+        value_class = _member_value_classes.get(self._type)
+        if value_class is not None:
+            self._value = value_class(tor_member[1:])
         else:
             self._value = GraspTorValue(tor_member[1])
 
@@ -143,15 +144,23 @@ class GraspTorMember:
             pass
 
     def __getitem__(self, key):
-        return self.value[key].value
+        """Return the value of the member key of a struct member.  This is the convenient way to index into structs,
+        use get_member for the GraspTorMember itself."""
+        return self._value[key].value
 
     def __setitem__(self, key, new_value):
-        self.value[key].value = new_value
+        self._value[key].value = new_value
+
+    def get_member(self, key):
+        """Return the GraspTorMember key of a struct member, without unwrapping its value."""
+        return self._value[key]
 
 
 class GraspTorRef:
     """A container for a value that is a reference to another GraspTorObject"""
 
+    __slots__ = ("ref",)
+
     def __init__(self, tor_ref=None):
 
         #: str: Reference to another GraspTorObject
@@ -164,8 +173,7 @@ class GraspTorRef:
         return "ref({:s})".format(self.ref)
 
     def fill(self, tor_ref):
-        if _debug_:
-            print("GraspTorRef.fill received: {:}".format(tor_ref))
+        log.debug("GraspTorRef.fill received: %r", tor_ref)
         self.ref = tor_ref[1]
 
 
@@ -187,19 +195,17 @@ class GraspTorSequence(list):
         return outstring
 
     def fill(self, tor_seq):
-        if _debug_:
-            print("GraspTorSequence.fill received: {:}".format(tor_seq))
+        log.debug("GraspTorSequence.fill received: %r", tor_seq)
 
-        for t in tor_seq[1:]:
-            self.append(GraspTorValue(t))
+        self.extend(map(GraspTorValue, tor_seq[1:]))
 
 
-class GraspTorStruct(OrderedDict):
+class GraspTorStruct(dict):
     """A container for a GraspTorStruct, that has a number of members.  Members are
-    stored as an OrderedDict."""
+    stored as a dict, in insertion order."""
 
     def __init__(self, tor_struct=None):
-        OrderedDict.__init__(self)
+        dict.__init__(self)
         if tor_struct:
             self.fill(tor_struct)
         else:
@@ -216,16 +222,20 @@ class GraspTorStruct(OrderedDict):
 
     def fill(self, tor_struct):
         """Fill the GraspTorObject using the pyparsing results"""
-        if _debug_:
-            print("GraspTorStruct.fill received: {:}".format(tor_struct))
+        log.debug("GraspTorStruct.fill received: %r", tor_struct)
+
+        self.update((t[0], GraspTorMember(t)) for t in tor_struct[1:])
+
 
-        for t in tor_struct[1:]:
-            self[t[0]] = GraspTorMember(t)
+"""Classes used to hold the value of a GraspTorMember, keyed by the member type"""
+_member_value_classes = {"struct": GraspTorStruct, "ref": GraspTorRef, "sequence": GraspTorSequence}
 
 
 class GraspTorComment:
     """A container for comments from a GraspTorFile"""
 
+    __slots__ = ("name", "_type", "text", "location")
+
     def __init__(self, tor_comment=None):
         #: str: Name of comment object
         self.name = None
@@ -246,12 +256,12 @@ class GraspTorComment:
         return "\n".join(self.text)
 
     def fill(self, tor_comment):
-        if _debug_:
-            print("GraspTorComment.fill received: {:}".format(tor_comment))
-            print("with name: {:}".format(tor_comment[0]))
+        log.debug("GraspTorComment.fill received: %r", tor_comment)
+        log.debug("with name: %r", tor_comment[0])
         self.name = tor_comment[0]
-        self.location = int(self.name.lstrip("comment"))
-        self.text = tor_comment[2]
+        self.location = tor_comment["_location"]
+        # Copy the lines, as the parse results may be shared through the _parse_tor_object cache
+        self.text = list(tor_comment[2])
 
     @property
     def type(self):
@@ -259,22 +269,43 @@ class GraspTorComment:
         return self._type
 
 
-class GraspTorObject(OrderedDict):
+class GraspTorObject(dict):
     """A container for a GraspTorObject, that has a name, a type and a number of members.  Members are
-    stored as an OrderedDict."""
+    stored as a dict, in insertion order."""
 
     def __init__(self, tor_obj=None):
-        OrderedDict.__init__(self)
+        dict.__init__(self)
         self._name = None
         self._type = None
 
-        if isinstance(tor_obj, str):
+        # Check the exact types first as they are by far the most common, then fall back to subclasses
+        if tor_obj is None:
+            return
+        elif type(tor_obj) is str:
             self.read_str(tor_obj)
+        elif type(tor_obj) is torparser.pp.ParseResults:
+            self.fill(tor_obj)
+        elif isinstance(tor_obj, str):
+            self.read_str(str(tor_obj))
         elif isinstance(tor_obj, torparser.pp.ParseResults):
             self.fill(tor_obj)
         else:
             pass
 
+    @classmethod
+    def from_string(cls, tor_str):
+        """Return a new GraspTorObject read from a string containing a single tor object"""
+        tor_obj = cls()
+        tor_obj.read_str(tor_str)
+        return tor_obj
+
+    @classmethod
+    def from_parse_results(cls, parse_results):
+        """Return a new GraspTorObject filled from the parser results for a single tor object"""
+        tor_obj = cls()
+        tor_obj.fill(parse_results)
+        return tor_obj
+
     def __repr__(self):
         """Return a useful string representation of the GraspTorObject object."""
         if self.type == "comment":
@@ -296,22 +327,20 @@ class GraspTorObject(OrderedDict):
 
     def read_str(self, tor_str):
         """Read the contents of the string into a tor_object and then process the results"""
-        res = torparser.tor_object.parseString(tor_str)
-        self.fill(res)
+        res = _parse_tor_object(tor_str)
+        self.fill(res[0])
 
     def fill(self, tor_obj):
         """Fill the GraspTorObject using the pyparsing results"""
-        if _debug_:
-            print("GraspTorObject.fill received: {:}".format(tor_obj))
-            print("Type:", type(tor_obj))
+        log.debug("GraspTorObject.fill received: %r", tor_obj)
+        log.debug("Type: %s", type(tor_obj))
 
         self._name = tor_obj[0]
         self._type = tor_obj[1]
-        for r in tor_obj[2:]:
-            if self._type == "comment":
-                self["comment"] = GraspTorComment(tor_obj)
-            else:
-                self[r[0]] = GraspTorMember(r)
+        if self._type == "comment":
+            self["comment"] = GraspTorComment(tor_obj)
+        else:
+            self.update((r[0], GraspTorMember(r)) for r in tor_obj[2:])
 
     @property
     def name(self):
@@ -338,14 +367,13 @@ class GraspTorObject(OrderedDict):
         self._type = new_type
 
 
-class GraspTorFile(OrderedDict):
-    """A container for objects read from a tor file.  Subclasses OrderedDict to provide a dict of torObjects
+class GraspTorFile(dict):
+    """A container for objects read from a tor file.  Subclasses dict to provide a dict of torObjects
      keyed by name, and sorted by insertion order"""
 
     def __init__(self, file_like=None):
         """Create a TorFile object, and if fileLike is specified, read the file"""
-        OrderedDict.__init__(self)
-        self._parser = torparser.tor_file
+        dict.__init__(self)
         if file_like:
             self.read(file_like)
 
@@ -357,18 +385,95 @@ class GraspTorFile(OrderedDict):
 
         return outstring
 
-    def read(self, file_like):
-        """Read a list of torObjects and torComments from a fileLike object.  We use pyparsing.ParserElement's parseFile
-        method, which can take either a file-like object or a filename to open.  If you wish to parse an existing string
-        object, used StringIO to supply a file-like object containing the string."""
-        # Parse the file
-        res = self._parser.parseFile(file_like)
+    def read(self, file_like, use_cache=False):
+        """Read a list of torObjects and torComments from a fileLike object.  file_like can be either a file-like
+        object or a filename to open.  If you wish to parse an existing string object, used StringIO to supply a
+        file-like object containing the string.
+
+        If use_cache is True and file_like is a filename or a named file object, the parsed objects are pickled to a
+        ``.gtfcache`` file next to the tor file, and later reads load them from there while the cache is newer than
+        the tor file.  Loading a pickle can run arbitrary code, so only use the cache with files you trust."""
+        cache_path = None
+        if use_cache:
+            if isinstance(file_like, (str, os.PathLike)):
+                tor_path = os.fspath(file_like)
+            else:
+                # Only cache file objects with a real file behind them, and not pseudo-names such as "<stdin>"
+                tor_path = getattr(file_like, "name", None)
+                if not isinstance(tor_path, str) or not os.path.isfile(tor_path):
+                    tor_path = None
+            if tor_path is not None:
+                cache_path = tor_path + ".gtfcache"
+
+        if cache_path and self._cache_is_current(cache_path, tor_path):
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                self.update(cached)
+                return
+
+        # Read the whole file in one go, and parse the resulting string
+        try:
+            tor_str = file_like.read()
+        except AttributeError:
+            # Tor files are read as UTF-8 regardless of the locale, as pyparsing's parse_file does
+            with open(file_like, "r", encoding="utf-8") as fi:
+                tor_str = fi.read()
+
+        # A tor file is a flat sequence of objects and comments, so scan it one object at a time and fill from each
+        # object's results.  The results are all kept until the file is known to be valid, so this doesn't reduce
+        # peak memory compared to parsing the whole file at once.
+        tor_objects = []
+        last_end = 0
+        for res, start, end in torparser.tor_object.scanString(tor_str):
+            if tor_str[last_end:start].strip():
+                break
+            tor_objects.append(res)
+            last_end = end
+
+        # If anything was skipped over or left at the end, parse the whole file to raise a meaningful ParseException.
+        # Only fill once the whole file is known to be valid, so a failed read leaves this object unchanged.
+        if last_end == 0 or tor_str[last_end:].strip():
+            torparser.tor_file.parseString(tor_str, parseAll=True)
+
+        for res in tor_objects:
+            self.fill(res)
+
+        if cache_path:
+            self._write_cache(cache_path)
+
+    @staticmethod
+    def _cache_is_current(cache_path, tor_path):
+        """Return True if the cache at cache_path exists and is newer than the tor file at tor_path."""
+        try:
+            return os.path.getmtime(cache_path) > os.path.getmtime(tor_path)
+        except OSError:
+            return False
+
+    @staticmethod
+    def _read_cache(cache_path):
+        """Return the objects pickled in cache_path, or None if the cache can't be read or was written by a different
+        version of graspfile."""
+        try:
+            with open(cache_path, "rb") as fi:
+                # The cache starts with the graspfile version that wrote it, as the pickled class layouts may change
+                if pickle.load(fi) != graspfile.__version__:
+                    log.debug("Ignoring tor file cache from another graspfile version: %s", cache_path)
+                    return None
+                return pickle.load(fi)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError) as err:
+            # The last three are raised when the pickled objects no longer match the classes here
+            log.warning("Could not read tor file cache %s: %s", cache_path, err)
+            return None
 
-        # Turn the parse results into objects
-        self.fill(res)
+    def _write_cache(self, cache_path):
+        """Pickle the objects in the GraspTorFile to cache_path, preceded by the graspfile version."""
+        try:
+            with open(cache_path, "wb") as fo:
+                pickle.dump(graspfile.__version__, fo, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(dict(self), fo, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as err:
+            log.warning("Could not write tor file cache %s: %s", cache_path, err)
 
     def fill(self, tor_file):
         """Fill the GraspTorFile using the parser results in tor_file"""
-        for r in tor_file:
-            temp = GraspTorObject(r)
-            self[temp.name] = temp
+        self.update((obj.name, obj) for obj in map(GraspTorObject.from_parse_results, tor_file))
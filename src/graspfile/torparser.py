@@ -1,40 +1,144 @@
-"""pyparsing parser for GRASP .tor files"""
+"""pyparsing parser for GRASP .tor files
 
-import pyparsing as pp
+Packrat memoization can be enabled for the parser by setting the ``GRASPFILE_PACKRAT`` environment variable before
+importing graspfile.  A value of ``1`` (or any other value that isn't a number, such as ``true``) enables a bounded
+cache of 128 entries, a larger integer sets the size of the cache and ``unbounded`` removes the limit.  ``0``,
+``false``, ``no`` and ``off`` leave it disabled, which is the default, as the tor grammar does little backtracking and
+parsing is faster without it.  Note that packrat caching is global to pyparsing, so it will also apply to any other
+pyparsing grammars used in the same process.
+"""
+
+import os
+import re
+import sys
+
+try:
+    # cPyparsing is a drop-in, compiled build of pyparsing that parses considerably faster, so use it if available
+    import cPyparsing as pp
+except ImportError:
+    import pyparsing as pp
+
+packrat_setting = os.environ.get("GRASPFILE_PACKRAT", "0").strip().lower()
+if packrat_setting == "unbounded":
+    pp.ParserElement.enablePackrat(cache_size_limit=None)
+elif packrat_setting not in ("", "0", "false", "no", "off"):
+    # The unbounded cache can grow very large for big inputs, so bound it unless told otherwise.  Values that aren't a
+    # cache size, such as "1" or "true", just turn packrat on with the default size
+    try:
+        packrat_cache_size = int(packrat_setting)
+    except ValueError:
+        packrat_cache_size = 128
+    if packrat_cache_size <= 1:
+        packrat_cache_size = 128
+    pp.ParserElement.enablePackrat(cache_size_limit=packrat_cache_size)
 
 LPAREN, RPAREN, COLON, COMMA = map(pp.Suppress, "():,")
 
-identifier = pp.Word(pp.alphas, pp.alphanums + "_")
+number_pattern = r"[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?"
+identifier_pattern = r"[A-Za-z][A-Za-z0-9_]*"
+
+identifier = pp.Regex(identifier_pattern)
 tor_comment = pp.OneOrMore(pp.dblSlashComment)
 
 
 def comment_handler(input_string, locn, tokens):
-    tokenstr = "\n".join(tokens)
-    mod_string = "comment{:d} comment\n(\n{:s}\n)".format(locn, tokenstr)
-    mod_def = pp.Dict(pp.Group(identifier.setResultsName("_name") + identifier.setResultsName("_type") + LPAREN + pp.Group(
-        pp.OneOrMore(pp.dblSlashComment)).setResultsName("text") + RPAREN))
-    return mod_def.parseString(mod_string)
+    """Shape a block of comment lines like a tor object named by its location, with type "comment" and the lines
+    as its text."""
+    name = "comment{:d}".format(locn)
+    text = pp.ParseResults(tokens.asList())
+    comment = pp.ParseResults([name, "comment", text])
+    comment["_name"] = name
+    comment["_type"] = "comment"
+    comment["text"] = text
+    comment["_location"] = locn
+    return [comment]
 
 
 tor_comment.setParseAction(comment_handler)
 tor_comment.setResultsName("_name")
 tor_comment.setResultsName("_type")
 
-tor_string = pp.dblQuotedString() | pp.Word(pp.alphas, pp.alphanums + "_-.")
-number = pp.pyparsing_common.number()
+tor_string = pp.dblQuotedString() | pp.Regex(r"[A-Za-z][A-Za-z0-9_.-]*")
+
+
+def to_number(num_str):
+    """Convert a number matched by number_pattern to an int or float, as pyparsing_common.number does"""
+    if num_str.lstrip("+-").isdigit():
+        return int(num_str)
+    return float(num_str)
+
+
+# Tor files only contain decimal numbers, so a single Regex does the job of pyparsing_common.number
+number = pp.Regex(number_pattern)
+number.setParseAction(lambda tokens: to_number(tokens[0]))
+
+
+# A number followed by its unit, e.g. "600.0 mm" or "10GHz", matched in one step and returned as a [value, unit] group
+number_with_unit = pp.Regex(r"(?P<number>{:s})\s*(?P<unit>{:s})".format(number_pattern, identifier_pattern))
+
+
+# Units and member names repeat many times through a tor file, so the handlers below intern them to share a single
+# string object for each
+def number_with_unit_handler(input_string, locn, tokens):
+    return [pp.ParseResults([to_number(tokens["number"]), sys.intern(tokens["unit"])])]
+
+
+number_with_unit.setParseAction(number_with_unit_handler)
 
 tor_members = pp.Forward()
 tor_value = pp.Forward()
 
 tor_struct = pp.Literal("struct").setResultsName("_type") + LPAREN + pp.Dict(tor_members) + RPAREN
 tor_sequence = pp.Literal("sequence").setResultsName("_type") + LPAREN + pp.delimitedList(tor_value) + RPAREN
+
+# Long sequences, such as lists of frequencies, usually contain only numbers with optional units.  Match the whole body
+# of these with one regular expression and split it into values, falling back to tor_sequence for anything else.
+numeric_item_pattern = r"(?P<number>{:s})(?:\s*(?P<unit>{:s}))?".format(number_pattern, identifier_pattern)
+numeric_item_re = re.compile(numeric_item_pattern)
+numeric_sequence_body = pp.Regex(r"{0:s}(?:\s*,\s*{0:s})*(?=\s*\))".format(
+    numeric_item_pattern.replace("?P<number>", "?:").replace("?P<unit>", "?:")))
+
+
+def numeric_sequence_handler(input_string, locn, tokens):
+    values = []
+    for item in numeric_item_re.finditer(tokens[0]):
+        if item.group("unit"):
+            values.append(pp.ParseResults([to_number(item.group("number")), sys.intern(item.group("unit"))]))
+        else:
+            values.append(to_number(item.group("number")))
+    return values
+
+
+numeric_sequence_body.setParseAction(numeric_sequence_handler)
+tor_numeric_sequence = pp.Literal("sequence").setResultsName("_type") + LPAREN + numeric_sequence_body + RPAREN
 tor_ref = pp.Literal("ref").setResultsName("_type") + LPAREN + identifier + RPAREN
-tor_value << (tor_sequence | tor_ref | tor_struct | tor_string | pp.Group(number + identifier) | number)
+# Alternatives are ordered by how often they occur in typical tor files, so that most values match on the first
+# attempt.  The keyword-led alternatives must still precede tor_string, which would otherwise match the keyword.
+tor_value << (number_with_unit | number | tor_ref | tor_struct | tor_numeric_sequence | tor_sequence | tor_string)
 
-member_def = pp.Dict(pp.Group(identifier + COLON + tor_value))
+# Most members are a plain number with an optional unit, e.g. "focal_length : 600.0 mm".  Match these with a single
+# regular expression, and only fall back to the full tor_value grammar for other members.
+simple_member = pp.Regex(r"(?P<name>{1:s})\s*:\s*(?P<number>{0:s})(?:[ \t]*(?P<unit>{1:s}))?(?=\s*[,)])".format(
+    number_pattern, identifier_pattern))
+
+
+def simple_member_handler(input_string, locn, tokens):
+    num = to_number(tokens["number"])
+    name = sys.intern(tokens["name"])
+    if tokens.get("unit"):
+        return [name, pp.ParseResults([num, sys.intern(tokens["unit"])])]
+    return [name, num]
+
+
+simple_member.setParseAction(simple_member_handler)
+
+member_def = pp.Dict(pp.Group(simple_member | identifier + COLON + tor_value))
 tor_members << pp.delimitedList(member_def)
 
 object_def = pp.Group(identifier.setResultsName("_name") + identifier.setResultsName("_type") + pp.Dict(
     LPAREN + pp.Optional(tor_members) + RPAREN))
 tor_object = pp.Dict(object_def | tor_comment)
 tor_file = pp.Dict(pp.OneOrMore(tor_object)) + pp.stringEnd
+
+# Do pyparsing's one-off optimization of the grammar now, rather than on the first parse
+tor_file.streamline()
@@ -1,5 +1,6 @@
 # test_cut.py
 
+import numpy
 import pytest
 from pytest import approx
 
@@ -83,3 +84,34 @@ def test_loading_cut(filled_grasp_cut):
 
     assert data_shape[0] == filled_grasp_cut.v_num
     assert data_shape[1] == filled_grasp_cut.field_components
+
+
+def test_select_pos_range(filled_grasp_cut):
+    """Check that a sub range of a single cut includes both end points"""
+    positions = filled_grasp_cut.positions
+    pos_min = positions[10]
+    pos_max = positions[20]
+
+    new_cut = filled_grasp_cut.select_pos_range(pos_min, pos_max)
+
+    assert new_cut.v_num == 11
+    assert new_cut.data.shape == (11, filled_grasp_cut.field_components)
+    assert new_cut.v_ini == approx(pos_min)
+    assert new_cut.positions[-1] == approx(pos_max)
+    assert new_cut.data == approx(filled_grasp_cut.data[10:21, :])
+
+
+def test_select_pos_range_decreasing():
+    """Check that a sub range is selected correctly from a cut swept with decreasing position"""
+    decreasing_cut = cut.GraspSingleCut()
+    decreasing_cut.v_ini = 10.0
+    decreasing_cut.v_inc = -1.0
+    decreasing_cut.v_num = 21
+    decreasing_cut.data = (numpy.arange(42) + 1j * numpy.arange(42)).reshape(21, 2)
+
+    new_cut = decreasing_cut.select_pos_range(-2.0, 3.0)
+
+    assert new_cut.v_num == 6
+    assert new_cut.v_ini == approx(3.0)
+    assert new_cut.positions[-1] == approx(-2.0)
+    assert new_cut.data == approx(decreasing_cut.data[7:13, :])
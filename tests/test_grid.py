@@ -1,5 +1,9 @@
 # test_grid.py
 
+import copy
+import io
+
+import numpy
 import pytest
 from pytest import approx
 
@@ -15,23 +19,62 @@ def empty_grasp_grid():
     return grid.GraspGrid()
 
 
-@pytest.fixture
-def grid_file():
-    """Return a file object that points to a GRASP Grid file"""
-    return open(test_grid_file)
+@pytest.fixture(scope="session")
+def grid_file_text():
+    """Return the contents of the GRASP Grid file, read from disk once per session"""
+    with open(test_grid_file) as fi:
+        return fi.read()
 
 
 @pytest.fixture
+def grid_file(grid_file_text):
+    """Return a file object containing the GRASP Grid file"""
+    return io.StringIO(grid_file_text)
+
+
+@pytest.fixture(scope="session")
 def write_filename():
     """Return a file name for test writing and reading back"""
     return "temp.grd"
 
+
+@pytest.fixture(scope="session")
+def pristine_grasp_grid(grid_file_text):
+    """Return a GraspGrid instance filled from the test grid file.  The file is only parsed once per session, so tests
+    using this fixture must not modify it."""
+    grasp_grid = grid.GraspGrid()
+    grasp_grid.read(io.StringIO(grid_file_text))
+    return grasp_grid
+
+
+@pytest.fixture(scope="session")
+def pristine_grasp_field(pristine_grasp_grid):
+    """Return the first GraspField from the pristine_grasp_grid fixture.  Tests must not modify it."""
+    return pristine_grasp_grid.fields[0]
+
+
+@pytest.fixture(scope="session")
+def written_grid_file(pristine_grasp_grid, tmp_path_factory, write_filename):
+    """Return the path of a file that the pristine_grasp_grid fixture has been written to"""
+    filename = tmp_path_factory.mktemp("grids") / write_filename
+    with open(filename, "w") as fo:
+        pristine_grasp_grid.write(fo)
+    return filename
+
+
+@pytest.fixture(scope="session")
+def roundtripped_grid(written_grid_file):
+    """Return a GraspGrid instance read back from the written_grid_file fixture.  Tests must not modify it."""
+    saved_grid = grid.GraspGrid()
+    with open(written_grid_file) as fi:
+        saved_grid.read(fi)
+    return saved_grid
+
+
 @pytest.fixture
-def filled_grasp_grid(empty_grasp_grid, grid_file):
-    """Return a GraspGrid instance filled from the grid_file."""
-    empty_grasp_grid.read(grid_file)
-    grid_file.close()
-    return empty_grasp_grid
+def filled_grasp_grid(pristine_grasp_grid):
+    """Return a copy of the pristine_grasp_grid fixture that tests can modify."""
+    return copy.deepcopy(pristine_grasp_grid)
 
 
 @pytest.fixture
@@ -40,122 +83,158 @@ def filled_grasp_field(filled_grasp_grid):
     return filled_grasp_grid.fields[0]
 
 
-def test_loading_grid(filled_grasp_grid):
+def test_loading_grid(pristine_grasp_grid):
     """Test loading grid from a TICRA Grid file."""
     # check that enough freqs and fields were read
-    assert len(filled_grasp_grid.freqs) > 0
-    assert len(filled_grasp_grid.fields) > 0
+    assert len(pristine_grasp_grid.freqs) > 0
+    assert len(pristine_grasp_grid.fields) > 0
 
     # Check that parameters were read correctly
-    assert filled_grasp_grid.ktype in [1]
-    assert type(filled_grasp_grid.nset) is int
-    assert filled_grasp_grid.polarization in range(1, 12)
-    assert filled_grasp_grid.field_components in [2, 3]
-    assert filled_grasp_grid.igrid in [2, 3, 8]
+    assert pristine_grasp_grid.ktype in [1]
+    assert type(pristine_grasp_grid.nset) is int
+    assert pristine_grasp_grid.polarization in range(1, 12)
+    assert pristine_grasp_grid.field_components in [2, 3]
+    assert pristine_grasp_grid.igrid in [2, 3, 8]
 
     # Check that beam centers were read correctly
-    assert len(filled_grasp_grid.beam_centers) > 0
-    for bc in filled_grasp_grid.beam_centers:
+    assert len(pristine_grasp_grid.beam_centers) > 0
+    for bc in pristine_grasp_grid.beam_centers:
         assert len(bc) == 2
 
 
+def test_rereading_grid(empty_grasp_grid, grid_file, pristine_grasp_grid):
+    """Test that reading the grid file again gives the same fields as the session's grid"""
+    empty_grasp_grid.read(grid_file)
+
+    assert len(empty_grasp_grid.fields) == len(pristine_grasp_grid.fields)
+    for field, pristine_field in zip(empty_grasp_grid.fields, pristine_grasp_grid.fields):
+        assert field.field == approx(pristine_field.field)
+
+
+sparse_grid_text = """VERSION: TICRA-EM-FIELD-V0.1
+Field data in grid
+SOURCE_FIELD_NAME: sparse_test
+FREQUENCY_NAME: frequency
+FREQUENCIES [GHz]:
+  0.1000000000E+03
+++++
+ 1
+ 1 3 2 1
+ 0 0
+ -1.0 -1.0 1.0 1.0
+ 3 3 1
+ 2 1
+ 1.0 2.0 3.0 4.0
+ 1 3
+ 5.0 6.0 7.0 8.0
+ 9.0 10.0 11.0 12.0
+ 13.0 14.0 15.0 16.0
+ 3 1
+ 17.0 18.0 19.0 20.0
+"""
+"""A small two component grid with sparse rows (k_limit = 1)"""
+
+
+def test_loading_sparse_grid():
+    """Test loading a grid with sparse rows, where points outside each row's limits are left as zero"""
+    sparse_grid = grid.GraspGrid()
+    sparse_grid.read(io.StringIO(sparse_grid_text))
+    field = sparse_grid.fields[0]
+
+    assert field.k_limit == 1
+    expected = numpy.zeros((3, 3, 2), dtype=complex)
+    expected[0, 1] = [1 + 2j, 3 + 4j]
+    expected[1, 0] = [5 + 6j, 7 + 8j]
+    expected[1, 1] = [9 + 10j, 11 + 12j]
+    expected[1, 2] = [13 + 14j, 15 + 16j]
+    expected[2, 2] = [17 + 18j, 19 + 20j]
+    numpy.testing.assert_array_equal(field.field, expected)
+
+
 def test_rotate_grid_polarization(filled_grasp_grid):
     """Check that rotate_polarization runs on all fields"""
     filled_grasp_grid.rotate_polarization()
     filled_grasp_grid.rotate_polarization(angle=-45.0)
 
 
-def test_loading_field(filled_grasp_field):
-    """Test the individual field loaded as part of filled_grasp_grid"""
+def test_loading_field(pristine_grasp_field):
+    """Test the individual field loaded as part of pristine_grasp_grid"""
+    field = pristine_grasp_field
+
     # check that field parameters were filled correctly
-    assert type(filled_grasp_field.beam_center[0]) is int
-    assert type(filled_grasp_field.beam_center[1]) is int
-    assert len(filled_grasp_field.beam_center) == 2
-
-    assert type(filled_grasp_field.grid_min_x) is float
-    assert type(filled_grasp_field.grid_min_y) is float
-    assert type(filled_grasp_field.grid_max_x) is float
-    assert type(filled_grasp_field.grid_max_y) is float
-    assert type(filled_grasp_field.grid_n_x) is int
-    assert type(filled_grasp_field.grid_n_y) is int
-    assert type(filled_grasp_field.grid_step_x) is float
-    assert type(filled_grasp_field.grid_step_y) is float
+    assert len(field.beam_center) == 2
+    grid_ints = (field.beam_center[0], field.beam_center[1], field.grid_n_x, field.grid_n_y)
+    assert all(type(v) is int for v in grid_ints)
+
+    grid_floats = (field.grid_min_x, field.grid_min_y, field.grid_max_x, field.grid_max_y, field.grid_step_x,
+                   field.grid_step_y)
+    assert all(type(v) is float for v in grid_floats)
 
     # Check that the step values are consistent with the other grid parameters
-    # (should find and use the "approx equal" test)
-    assert filled_grasp_field.grid_step_x == approx(
-        (filled_grasp_field.grid_max_x - filled_grasp_field.grid_min_x) / (filled_grasp_field.grid_n_x - 1))
-    assert filled_grasp_field.grid_step_y == approx((filled_grasp_field.grid_max_y - filled_grasp_field.grid_min_y) / (
-        filled_grasp_field.grid_n_y - 1))
+    grid_steps = numpy.array([field.grid_step_x, field.grid_step_y])
+    grid_spans = numpy.array([field.grid_max_x - field.grid_min_x, field.grid_max_y - field.grid_min_y])
+    grid_n = numpy.array([field.grid_n_x, field.grid_n_y])
+    numpy.testing.assert_allclose(grid_steps, grid_spans / (grid_n - 1))
 
-    assert filled_grasp_field.k_limit in [0, 1]
-    assert filled_grasp_field.field_components in [2, 3]
+    assert field.k_limit in [0, 1]
+    assert field.field_components in [2, 3]
 
     # Check that the shape of the field is consistent with grid parameters
-    field_shape = filled_grasp_field.field.shape
+    assert field.field.shape == (field.grid_n_x, field.grid_n_y, field.field_components)
 
-    assert field_shape[0] == filled_grasp_field.grid_n_x
-    assert field_shape[1] == filled_grasp_field.grid_n_y
-    assert field_shape[2] == filled_grasp_field.field_components
 
-
-def test_writing_grid(filled_grasp_grid, tmp_path, write_filename):
+def test_writing_grid(pristine_grasp_grid, roundtripped_grid):
     """Test writing of filled grid to file, and then reading it back"""
-    filename = tmp_path / write_filename
-    fo = open(filename, "w")
-    filled_grasp_grid.write(fo)
-    fo.close()
-
-    fi = open(filename, "r")
-    saved_grid = grid.GraspGrid()
-    saved_grid.read(fi)
-    fi.close()
+    saved_grid = roundtripped_grid
 
     # Check that all the freqs and fields were read
-    assert len(filled_grasp_grid.freqs) == len(saved_grid.freqs)
-    assert len(filled_grasp_grid.fields) == len(saved_grid.fields)
+    assert len(pristine_grasp_grid.freqs) == len(saved_grid.freqs)
+    assert len(pristine_grasp_grid.fields) == len(saved_grid.fields)
 
     # Check that parameters were read correctly
-    assert filled_grasp_grid.ktype == saved_grid.ktype
-    assert filled_grasp_grid.nset == saved_grid.nset
-    assert filled_grasp_grid.polarization == saved_grid.polarization
-    assert filled_grasp_grid.field_components == saved_grid.field_components
-    assert filled_grasp_grid.igrid == saved_grid.igrid
+    assert pristine_grasp_grid.ktype == saved_grid.ktype
+    assert pristine_grasp_grid.nset == saved_grid.nset
+    assert pristine_grasp_grid.polarization == saved_grid.polarization
+    assert pristine_grasp_grid.field_components == saved_grid.field_components
+    assert pristine_grasp_grid.igrid == saved_grid.igrid
 
+    # Check that the field data survived the round trip unchanged
+    numpy.testing.assert_array_equal(pristine_grasp_grid.freqs, saved_grid.freqs)
+    for field, saved_field in zip(pristine_grasp_grid.fields, saved_grid.fields):
+        assert numpy.array_equal(field.field, saved_field.field)
 
-def test_index_radial_dist(filled_grasp_field):
+
+def test_index_radial_dist(pristine_grasp_field):
     """Test the return of an array of radial distances of grid points"""
-    rdist = filled_grasp_field.index_radial_dist(3, 2)
+    rdist = pristine_grasp_field.index_radial_dist(3, 2)
     assert rdist >= 0.0
 
 
-def test_grid_pos(filled_grasp_field):
+def test_grid_pos(pristine_grasp_field):
     """Test the return of the meshed grid of positions"""
-    xgrid, ygrid = filled_grasp_field.positions
-
-    assert xgrid.shape == (filled_grasp_field.grid_n_x, filled_grasp_field.grid_n_y)
-    assert ygrid.shape == (filled_grasp_field.grid_n_x, filled_grasp_field.grid_n_y)
-
+    xgrid, ygrid = pristine_grasp_field.positions
 
-def test_radius_grid(filled_grasp_field):
-    rgrid = filled_grasp_field.radius_grid()
+    assert xgrid.shape == (pristine_grasp_field.grid_n_x, pristine_grasp_field.grid_n_y)
+    assert ygrid.shape == (pristine_grasp_field.grid_n_x, pristine_grasp_field.grid_n_y)
 
-    assert rgrid.shape == (filled_grasp_field.grid_n_x, filled_grasp_field.grid_n_y)
 
-    rgrid2 = filled_grasp_field.radius_grid((0.1, 0.1))
+def test_radius_grid(pristine_grasp_field):
+    rgrid = pristine_grasp_field.radius_grid()
 
-    assert rgrid2.shape == (filled_grasp_field.grid_n_x, filled_grasp_field.grid_n_y)
+    assert rgrid.shape == (pristine_grasp_field.grid_n_x, pristine_grasp_field.grid_n_y)
 
+    rgrid2 = pristine_grasp_field.radius_grid((0.1, 0.1))
 
-def test_rotate_polarization(filled_grasp_field):
-    ang = 180.0
+    assert rgrid2.shape == (pristine_grasp_field.grid_n_x, pristine_grasp_field.grid_n_y)
 
-    rot_field = filled_grasp_field
 
-    rot_field.rotate_polarization(ang)
-    rot_field.rotate_polarization(ang)
+@pytest.mark.parametrize("ang", [180.0, 90.0, 45.0])
+def test_rotate_polarization(filled_grasp_field, pristine_grasp_field, ang):
+    """Test that rotating the polarization by ang and then back again returns the original field"""
+    filled_grasp_field.rotate_polarization(ang)
+    filled_grasp_field.rotate_polarization(-ang)
 
-    assert rot_field.field == approx(filled_grasp_field.field)
+    numpy.testing.assert_allclose(filled_grasp_field.field, pristine_grasp_field.field, rtol=1e-12, atol=1e-12)
 
 
 def test_combine_grid(filled_grasp_grid):
@@ -1,6 +1,7 @@
 # test_file.py
 
 import io
+import pickle
 
 import pytest
 
@@ -22,12 +23,25 @@ def input_file_object():
     return open(test_file)
 
 
-@pytest.fixture
-def filled_tor_file(empty_tor_file, input_file_object):
-    """Return a GraspTorFile instance filled from the tor_file"""
-    empty_tor_file.read(input_file_object)
-    input_file_object.close()
-    return empty_tor_file
+@pytest.fixture(scope="session")
+def filled_tor_file():
+    """Return a GraspTorFile instance filled from the tor_file.  The file is only parsed once per session, so tests
+    using this fixture must not modify it."""
+    tor_file = graspfile.torfile.GraspTorFile()
+    with open(test_file) as fi:
+        tor_file.read(fi)
+    tor_text = repr(tor_file)
+
+    yield tor_file
+
+    # Catch any test that has modified the shared instance
+    assert repr(tor_file) == tor_text, "filled_tor_file was modified during the test session"
+
+
+@pytest.fixture(scope="session")
+def filled_tor_file_repr(filled_tor_file):
+    """Return the tor file text produced by repr of the filled_tor_file fixture"""
+    return repr(filled_tor_file)
 
 
 def test_loading_tor_file(filled_tor_file):
@@ -39,15 +53,192 @@ def test_loading_tor_file(filled_tor_file):
     assert len(filled_tor_file["single_frequencies"].keys()) > 0
 
 
-def test_reloading_tor_file(filled_tor_file):
-    """Test outputting the filled_tor_file to text and reloading it with StringIO"""
-    test_str = repr(filled_tor_file)
+def test_reading_tor_file_object(empty_tor_file, input_file_object, filled_tor_file):
+    """Test reading from an open file object into an empty GraspTorFile"""
+    empty_tor_file.read(input_file_object)
+    input_file_object.close()
+
+    assert list(empty_tor_file.keys()) == list(filled_tor_file.keys())
+
 
-    try:
-        test_io = io.StringIO(test_str)
-    except TypeError:
-        test_io = io.StringIO(unicode(test_str))
+def test_reading_malformed_tor_file(empty_tor_file):
+    """Test that a malformed tor file raises an exception and leaves the GraspTorFile empty"""
+    with pytest.raises(graspfile.torparser.pp.ParseException):
+        empty_tor_file.read(io.StringIO("a  b\n(\n  x : 1\n)\njunk\nc  d\n(\n  y : 2\n)\n"))
 
-    reload_tor_file = graspfile.torfile.GraspTorFile(test_io)
+    assert len(empty_tor_file) == 0
+
+
+def test_reloading_tor_file(filled_tor_file, filled_tor_file_repr):
+    """Test outputting the filled_tor_file to text and reloading it with StringIO"""
+    reload_tor_file = graspfile.torfile.GraspTorFile(io.StringIO(filled_tor_file_repr))
 
     assert len(filled_tor_file.keys()) == len(reload_tor_file.keys())
+
+
+def test_tor_object_from_string():
+    """Test creating GraspTorObjects from strings, including repeated identical strings"""
+    tor_str = """single_rim  elliptical_rim
+(
+  centre           : struct(x: 520.0 mm, y: 0.0 mm),
+  half_axis        : struct(x: 500.0 mm, y: 500.0 mm)
+)"""
+    tor_obj = graspfile.torfile.GraspTorObject(tor_str)
+    assert tor_obj.name == "single_rim"
+    assert tor_obj.type == "elliptical_rim"
+    assert tor_obj["centre"]["x"] == 520.0
+
+    # A second object from the same string must be independent of the first
+    other_obj = graspfile.torfile.GraspTorObject(tor_str)
+    other_obj["centre"]["x"] = 0.0
+    assert tor_obj["centre"]["x"] == 520.0
+
+    # Subclasses of str are read as well
+    class TorStr(str):
+        pass
+
+    assert graspfile.torfile.GraspTorObject(TorStr(tor_str))["centre"]["x"] == 520.0
+
+    # Objects built from the same comment are also independent
+    comment_str = "// A comment\n// over two lines"
+    comment_obj = graspfile.torfile.GraspTorObject(comment_str)
+    comment_obj["comment"].text.append("// an extra line")
+    assert graspfile.torfile.GraspTorObject(comment_str)["comment"].text == ["// A comment", "// over two lines"]
+
+
+def test_tor_member_get_member():
+    """Test getting the GraspTorMember of a struct member"""
+    tor_obj = graspfile.torfile.GraspTorObject("""single_rim  elliptical_rim
+(
+  centre           : struct(x: 520.0 mm, y: 0.0 mm)
+)""")
+    member = tor_obj["centre"].get_member("x")
+    assert isinstance(member, graspfile.torfile.GraspTorMember)
+    assert member.value == tor_obj["centre"]["x"]
+    assert member.unit == "mm"
+
+
+def test_loading_tor_comments(filled_tor_file):
+    """Test that comment blocks are loaded as comment objects"""
+    comments = [obj for obj in filled_tor_file.values() if obj.type == "comment"]
+    assert len(comments) > 0
+
+    for comment_obj in comments:
+        comment = comment_obj["comment"]
+        assert comment.name == comment_obj.name
+        assert comment.name == "comment{:d}".format(comment.location)
+        assert len(comment.text) > 0
+        for line in comment.text:
+            assert line.startswith("//")
+
+
+def test_tor_object_from_string_classmethod():
+    """Test creating a GraspTorObject with the from_string factory"""
+    tor_obj = graspfile.torfile.GraspTorObject.from_string("single_surface  paraboloid\n(\n  focal_length : 600.0 mm\n)")
+    assert tor_obj.name == "single_surface"
+    assert tor_obj.type == "paraboloid"
+    assert tor_obj["focal_length"].value == 600.0
+    assert tor_obj["focal_length"].unit == "mm"
+
+
+def test_tor_numeric_sequence():
+    """Test that sequences of numbers, with and without units, are parsed into values"""
+    tor_obj = graspfile.torfile.GraspTorObject.from_string(
+        "freqs  frequency\n(\n  frequency_list : sequence(10.0 GHz, 12 GHz,\n  1.4e1 GHz),\n  weights : sequence(1, 0.5)\n)")
+
+    frequencies = tor_obj["frequency_list"].value
+    assert [f.value for f in frequencies] == [10.0, 12, 14.0]
+    assert [f.unit for f in frequencies] == ["GHz", "GHz", "GHz"]
+
+    weights = tor_obj["weights"].value
+    assert [w.value for w in weights] == [1, 0.5]
+    assert [w.unit for w in weights] == [None, None]
+
+
+def test_tor_unit_without_space():
+    """Test that units written directly after a number are parsed, in members and in sequences"""
+    tor_obj = graspfile.torfile.GraspTorObject.from_string(
+        "freqs  frequency\n(\n  frequency : 10GHz,\n  frequency_list : sequence(10GHz, 12 GHz)\n)")
+
+    assert tor_obj["frequency"].value == 10
+    assert tor_obj["frequency"].unit == "GHz"
+
+    frequencies = tor_obj["frequency_list"].value
+    assert [f.value for f in frequencies] == [10, 12]
+    assert [f.unit for f in frequencies] == ["GHz", "GHz"]
+
+
+def test_cached_tor_file(filled_tor_file_repr, tmp_path):
+    """Test reading a tor file through the pickled cache"""
+    tor_path = tmp_path / "cached.tor"
+    tor_path.write_text(filled_tor_file_repr)
+
+    first_read = graspfile.torfile.GraspTorFile()
+    first_read.read(str(tor_path), use_cache=True)
+    assert (tmp_path / "cached.tor.gtfcache").exists()
+
+    second_read = graspfile.torfile.GraspTorFile()
+    second_read.read(str(tor_path), use_cache=True)
+    assert list(second_read.keys()) == list(first_read.keys())
+    assert repr(second_read) == repr(first_read)
+
+
+def test_cached_tor_file_failures(filled_tor_file_repr, tmp_path, monkeypatch):
+    """Test that the pickled cache is skipped for unnamed files, when it can't be written, or when it was written by
+    another graspfile version"""
+    monkeypatch.chdir(tmp_path)
+
+    # A file object whose name isn't a real file isn't cached
+    tor_io = io.StringIO(filled_tor_file_repr)
+    tor_io.name = "<stdin>"
+    for i in range(2):
+        stdin_read = graspfile.torfile.GraspTorFile()
+        stdin_read.read(tor_io, use_cache=True)
+        tor_io.seek(0)
+        assert repr(stdin_read) == filled_tor_file_repr
+    assert list(tmp_path.iterdir()) == []
+
+    # A cache path that can't be written to
+    tor_path = tmp_path / "cached.tor"
+    tor_path.write_text(filled_tor_file_repr)
+    (tmp_path / "cached.tor.gtfcache").mkdir()
+    unwritable_read = graspfile.torfile.GraspTorFile()
+    unwritable_read.read(str(tor_path), use_cache=True)
+    assert repr(unwritable_read) == filled_tor_file_repr
+
+    # A cache from this version that refers to a class that no longer exists
+    (tmp_path / "cached.tor.gtfcache").rmdir()
+    with open(str(tor_path) + ".gtfcache", "wb") as fo:
+        pickle.dump(graspfile.__version__, fo)
+        fo.write(b"cgraspfile.torfile\nNoSuchClass\n.")
+    assert graspfile.torfile.GraspTorFile._read_cache(str(tor_path) + ".gtfcache") is None
+
+    graspfile.torfile.GraspTorFile().read(str(tor_path), use_cache=True)
+
+    # A cache from another version is ignored, and replaced by a new cache
+    monkeypatch.setattr(graspfile, "__version__", "0.0.0")
+    assert graspfile.torfile.GraspTorFile._read_cache(str(tor_path) + ".gtfcache") is None
+    other_version_read = graspfile.torfile.GraspTorFile()
+    other_version_read.read(str(tor_path), use_cache=True)
+    assert repr(other_version_read) == filled_tor_file_repr
+    assert graspfile.torfile.GraspTorFile._read_cache(str(tor_path) + ".gtfcache") is not None
+
+
+def test_cached_tor_file_path(filled_tor_file_repr, tmp_path, monkeypatch):
+    """Test that the cache for a pathlib.Path input is kept next to the tor file"""
+    tor_dir = tmp_path / "data"
+    tor_dir.mkdir()
+    tor_path = tor_dir / "cached.tor"
+    tor_path.write_text(filled_tor_file_repr)
+
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    monkeypatch.chdir(work_dir)
+
+    for i in range(2):
+        path_read = graspfile.torfile.GraspTorFile()
+        path_read.read(tor_path, use_cache=True)
+        assert repr(path_read) == filled_tor_file_repr
+
+    assert (tor_dir / "cached.tor.gtfcache").exists()
+    assert list(work_dir.iterdir()) == []